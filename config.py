@@ -8,6 +8,9 @@ import os
 import yaml
 from pathlib import Path
 
+# Prefer the libyaml C parser when PyYAML was built against it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # Base directories
 ROOT_DIR = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -22,6 +25,11 @@ logger.info(f"Using DATA_DIR: {DATA_DIR}")
 logger.info(f"Using SCENES_DIR: {SCENES_DIR}")
 OUTPUT_DIR = ROOT_DIR / "output" / "scenes"
 
+# SQLite file that keeps LLM responses across restarts; empty disables it.
+# Entries are keyed on provider, model name and prompt, never expire, and are
+# trimmed to the most recently used llm.local_llm.PERSISTENT_CACHE_SIZE
+LLM_CACHE_DB = os.environ.get('LLM_CACHE_DB', '')
+
 # Default configuration
 DEFAULT_CONFIG = {
     "llm_model": "gemini",
@@ -149,7 +157,7 @@ def load_scene(scene_path):
         # Load based on file type
         if ext.lower() in ['.yaml', '.yml']:
             with open(scene_path, 'r') as f:
-                scene_data = yaml.safe_load(f)
+                scene_data = yaml.load(f, Loader=YAML_LOADER)
         elif ext.lower() == '.json':
             import json
             with open(scene_path, 'r') as f:
@@ -10,6 +10,7 @@ import time
 import json
 from pathlib import Path
 import re
+from collections import deque
 
 from modes.llm_mode import LLMController
 from modes.os_mode import OSController
@@ -20,6 +21,23 @@ import config as app_config
 # Setup logger
 logger = setup_logger()
 
+# Common confirmation phrases, accepted alone or followed by more words
+_CONFIRMATIONS = (
+    "yes", "sure", "ok", "okay", "y", "yep", "yeah", "confirm",
+    "do it", "execute", "run it", "proceed", "go", "go ahead"
+)
+_CONFIRMATION_RE = re.compile(
+    r"(?:%s)(?: |\Z)" % "|".join(map(re.escape, _CONFIRMATIONS))
+)
+# Bare confirmations ("yes", "y", ...) are the common case and skip the regex
+_CONFIRMATION_WORDS = frozenset(_CONFIRMATIONS)
+
+# Inputs that end an interactive session from LLM mode
+_EXIT_COMMANDS = frozenset({"exit", "quit", "bye"})
+
+# Action types answered in LLM mode without switching to OS mode
+_LLM_ONLY_ACTIONS = frozenset({"clarify", "explain", "explain_download", "none"})
+
 class Wrapper:
     """
     Wrapper controller implementing the two-mode architecture:
@@ -62,7 +80,7 @@ class Wrapper:
         # Initialize state
         self.current_mode = "LLM"  # Start in LLM mode
         self.pending_action = None
-        self.conversation_history = []
+        self.conversation_history = self._new_history()
         self.retry_count = 0
         self.last_user_input = None
         self.last_response = None
@@ -137,11 +155,12 @@ class Wrapper:
         is_valid, validation_reason = self.os_controller.validate_action(action)
         
         if is_valid:
-            logger.info(f"Valid action detected: {action['type']}")
+            action_type = action["type"]
+            logger.info(f"Valid action detected: {action_type}")
             
             # Check for special action types that remain in LLM mode
-            if action["type"] in ["clarify", "explain", "explain_download", "none"]:
-                logger.info(f"Action {action['type']} doesn't require mode switch")
+            if action_type in _LLM_ONLY_ACTIONS:
+                logger.info(f"Action {action_type} doesn't require mode switch")
                 # Reset retry count on successful processing
                 self.retry_count = 0
             else:
@@ -253,15 +272,10 @@ class Wrapper:
         # Convert to lowercase
         input_lower = user_input.lower().strip()
         
-        # Common confirmation phrases
-        confirmations = [
-            "yes", "sure", "ok", "okay", "y", "yep", "yeah", "confirm", 
-            "do it", "execute", "run it", "proceed", "go", "go ahead"
-        ]
-        
         # Check if input matches any confirmation phrase
-        return any(input_lower == confirm or input_lower.startswith(confirm + " ") 
-                  for confirm in confirmations)
+        if input_lower in _CONFIRMATION_WORDS:
+            return True
+        return _CONFIRMATION_RE.match(input_lower) is not None
     
     def _update_conversation(self, user_input, response_text):
         """Update conversation history.
@@ -270,14 +284,7 @@ class Wrapper:
             user_input: User text input
             response_text: Assistant response text
         """
-        self.conversation_history.append({
-            "user": user_input,
-            "assistant": response_text
-        })
-        
-        # Limit history size
-        while len(self.conversation_history) > self.config["max_history"]:
-            self.conversation_history.pop(0)
+        self._append_history(user_input, response_text)
     
     def _update_system_action(self, action, result):
         """Update conversation history with system action.
@@ -305,14 +312,31 @@ class Wrapper:
             message = f"[System action: {action_type}]"
         
         # Add to conversation history as a system message
-        self.conversation_history.append({
-            "user": "[System action requested]",
-            "assistant": message
-        })
-        
-        # Limit history size
-        while len(self.conversation_history) > self.config["max_history"]:
-            self.conversation_history.pop(0)
+        self._append_history("[System action requested]", message)
+    
+    def _append_history(self, user_text, assistant_text):
+        """Append one exchange to the conversation history.
+        
+        An exchange identical to the last one is not stored twice.
+        
+        Args:
+            user_text: User side of the exchange
+            assistant_text: Assistant side of the exchange
+        """
+        exchange = {"user": user_text, "assistant": assistant_text}
+        if self.conversation_history and self.conversation_history[-1] == exchange:
+            return
+        
+        # The history is bounded, so appending evicts the oldest exchange
+        self.conversation_history.append(exchange)
+    
+    def _new_history(self):
+        """Create an empty conversation history bounded by max_history.
+        
+        Returns:
+            deque: History that drops its oldest exchange when full
+        """
+        return deque(maxlen=self.config["max_history"])
     
     def get_opening_message(self):
         """Get an opening message based on the scene.
@@ -330,7 +354,9 @@ class Wrapper:
         self.current_mode = "LLM"
         self.pending_action = None
         self.retry_count = 0
-        self.conversation_history = []
+        self.conversation_history = self._new_history()
+        self.last_user_input = None
+        self.last_response = None
         logger.info("Wrapper controller reset to initial state")
 
     def run_interactive_session(self):
@@ -360,7 +386,7 @@ class Wrapper:
                     break
                     
                 # Check for exit command in LLM mode
-                if user_input.lower() in ['exit', 'quit', 'bye'] and self.current_mode == "LLM":
+                if user_input.lower() in _EXIT_COMMANDS and self.current_mode == "LLM":
                     print("\nEnding assistant session.")
                     break
                     
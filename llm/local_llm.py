@@ -5,9 +5,14 @@ Supports multiple LLM backends (Claude, LLaMA, Gemini) with fallbacks.
 """
 
 import os
+import re
 import json
+import time
+import sqlite3
+import hashlib
 import requests
 import logging
+from collections import OrderedDict
 from tools.logger import setup_logger
 import config as app_config
 
@@ -22,6 +27,18 @@ except ImportError:
     GEMINI_AVAILABLE = False
     logger.warning("Google Generative AI package not available. Install with 'pip install google-generativeai'")
 
+# Number of distinct prompts whose LLM responses are kept in memory
+RESPONSE_CACHE_SIZE = 512
+
+# Number of responses kept in the persistent cache, least recently used dropped first
+PERSISTENT_CACHE_SIZE = 10000
+
+# Text file names mentioned in a prompt, used by the simulated responses
+_TXT_FILE_RE = re.compile(r'([a-zA-Z0-9_\-\.]+\.txt)')
+
+# Markers placed before the current user input by the standard and scene prompts
+_CURRENT_INPUT_MARKERS = ("## Current User Input\n", "\nUser: ")
+
 class LLMProvider:
     """
     Provider for LLM services with multiple model support and fallbacks.
@@ -36,6 +53,13 @@ class LLMProvider:
         self.model_type = model_type
         self.simulation_mode = True  # Default to simulation for now
         
+        # Responses from real models, keyed on a digest of (model, prompt)
+        # and evicted least recently used first
+        self._response_cache = OrderedDict()
+        
+        # Optional on-disk copy of the cache that outlives the process
+        self._cache_db = self._open_cache_db(app_config.LLM_CACHE_DB)
+        
         # Check available models and set up best available
         if self._check_ollama_available() and model_type == "llama":
             self.simulation_mode = False
@@ -95,18 +119,32 @@ class LLMProvider:
         
         # If not in simulation mode, try to use the actual LLM
         if not self.simulation_mode:
+            # Identical prompts to the same model are answered from the cache
+            cache_key = self._cache_key(prompt)
+            response = self._response_cache.get(cache_key)
+            if response is not None:
+                logger.info("Using cached LLM response")
+                self._response_cache.move_to_end(cache_key)
+                return response
+            
+            response = self._load_cached_response(cache_key)
+            if response is not None:
+                logger.info("Using persisted LLM response")
+                self._cache_response(cache_key, response)
+                return response
+            
+            response = None
             if self.model_type == "llama":
                 response = self._call_ollama(prompt)
-                if response:
-                    return response
             elif self.model_type == "gemini":
                 response = self._call_gemini(prompt)
-                if response:
-                    return response
             elif self.model_type == "claude":
                 response = self._call_claude(prompt)
-                if response:
-                    return response
+            
+            if response:
+                self._cache_response(cache_key, response)
+                self._persist_response(cache_key, response)
+                return response
                     
             # Fall back to simulation if the LLM call fails
             logger.warning("LLM call failed, falling back to simulation mode")
@@ -114,6 +152,96 @@ class LLMProvider:
         # Simulation mode (hardcoded responses for testing)
         return self._simulate_response(prompt)
     
+    def _cache_key(self, prompt):
+        """Build the response cache key for a prompt.
+        
+        Args:
+            prompt: The prompt to send to the LLM
+            
+        Returns:
+            bytes: Fixed-size digest of the model type, model name and prompt
+        """
+        model_name = app_config.LLM_PROVIDERS[self.model_type]["model_name"]
+        data = f"{self.model_type}|{model_name}|{prompt}".encode("utf-8")
+        return hashlib.blake2b(data, digest_size=16).digest()
+    
+    def _cache_response(self, cache_key, response):
+        """Store a model response, evicting the least recently used entry when full.
+        
+        Args:
+            cache_key: Key from _cache_key
+            response: The generated response text
+        """
+        self._response_cache[cache_key] = response
+        self._response_cache.move_to_end(cache_key)
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+    
+    def _open_cache_db(self, db_path):
+        """Open the persistent response cache.
+        
+        Args:
+            db_path: Path to the SQLite file, or an empty value to disable it
+            
+        Returns:
+            sqlite3.Connection or None: Open connection, or None if disabled or unavailable
+        """
+        if not db_path:
+            return None
+        
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS llm_cache (k BLOB PRIMARY KEY, v TEXT NOT NULL, t REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_t ON llm_cache (t)")
+            logger.info(f"Persisting LLM responses to {db_path}")
+            return conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not open LLM cache database {db_path}: {e}")
+            return None
+    
+    def _load_cached_response(self, cache_key):
+        """Look up a response in the persistent cache.
+        
+        Args:
+            cache_key: Key from _cache_key
+            
+        Returns:
+            str or None: The stored response text, or None on a miss
+        """
+        if self._cache_db is None:
+            return None
+        
+        try:
+            row = self._cache_db.execute("SELECT v FROM llm_cache WHERE k = ?", (cache_key,)).fetchone()
+            if row:
+                # Mark the entry as recently used so trimming keeps it
+                self._cache_db.execute("UPDATE llm_cache SET t = ? WHERE k = ?", (time.time(), cache_key))
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            return None
+        return row[0] if row else None
+    
+    def _persist_response(self, cache_key, response):
+        """Write a response to the persistent cache, trimming it to PERSISTENT_CACHE_SIZE.
+        
+        Args:
+            cache_key: Key from _cache_key
+            response: The generated response text
+        """
+        if self._cache_db is None:
+            return
+        
+        try:
+            self._cache_db.execute("INSERT OR REPLACE INTO llm_cache (k, v, t) VALUES (?, ?, ?)",
+                                   (cache_key, response, time.time()))
+            self._cache_db.execute(
+                "DELETE FROM llm_cache WHERE t < (SELECT t FROM llm_cache ORDER BY t DESC LIMIT 1 OFFSET ?)",
+                (PERSISTENT_CACHE_SIZE - 1,)
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+    
     def _call_ollama(self, prompt):
         """Call the Ollama API to get a response.
         
@@ -233,11 +361,18 @@ class LLMProvider:
         # Very simple simulation that returns a generic response
         # In practice, this could be more sophisticated based on the prompt
         
+        # Only answer the current user input; earlier turns in the prompt would
+        # otherwise keep triggering the same action
+        for marker in _CURRENT_INPUT_MARKERS:
+            if marker in prompt:
+                prompt = prompt.rpartition(marker)[2]
+                break
+        prompt_lower = prompt.lower()
+        
         # Check for file operations
-        if "file" in prompt.lower() and ".txt" in prompt.lower():
+        if "file" in prompt_lower and ".txt" in prompt_lower:
             # Extract filename using simple regex
-            import re
-            match = re.search(r'([a-zA-Z0-9_\-\.]+\.txt)', prompt.lower())
+            match = _TXT_FILE_RE.search(prompt_lower)
             if match:
                 filename = match.group(1)
                 return f'''{{
@@ -249,7 +384,7 @@ class LLMProvider:
 }}'''
         
         # Check for directory listing
-        if "list" in prompt.lower() and "file" in prompt.lower():
+        if "list" in prompt_lower and "file" in prompt_lower:
             return f'''{{
   "response": "I'll list the files in the current directory for you.",
   "action": {{
@@ -5,6 +5,7 @@ This module handles the processing of user input through the LLM service,
 validates responses, and extracts actions.
 """
 
+import functools
 import json
 import re
 import os
@@ -19,6 +20,66 @@ import config as app_config
 # Setup logger
 logger = setup_logger()
 
+# Requests to list the files in the data directory, combined into one
+# alternation so a single scan decides whether any phrasing matches
+_LIST_FILES_RE = re.compile(
+    r"(?:can you )?(list|show|display) (?:all )?(?:the )?files(?: in this directory)?"
+    r"|what files (?:are|do we have)(?: in this directory)?"
+    r"|(?:can you )?show me (?:all )?(?:the )?files"
+)
+
+# JSON payloads in LLM responses, fenced or bare
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*({[\s\S]*?})\s*```')
+_JSON_OBJECT_RE = re.compile(r'({[\s\S]*?})')
+
+# File operations announced in plain-text LLM responses. The read phrasings
+# share one alternation and a single capture group for the path.
+_READ_FILE_RE = re.compile(
+    r"(?:show you what's in|show you the contents of|read|open) "
+    r"([a-zA-Z0-9_\-\.\/~]+\.[a-zA-Z0-9]+)"
+)
+_CHECK_FILE_RE = re.compile(r"check if ([a-zA-Z0-9_\-\.\/~]+\.[a-zA-Z0-9]+) exists")
+
+# Common file viewing and reading phrasings, one alternative per phrasing.
+# Each alternative has exactly one capturing group: the file name.
+_FILE_NAME = r"([a-zA-Z0-9_\.\/-]+\.[a-zA-Z0-9]+)"
+_VIEW_FILE_RE = re.compile("|".join([
+    r"what(?:'s| is) in (?:the )?file (?:named )?[\"']?" + _FILE_NAME + r"[\"']?",
+    r"(?:show|display|view|read|open|cat)(?:[ \t]+me)? (?:the )?(?:contents of )?(?:file )?[\"']?" + _FILE_NAME + r"[\"']?",
+    r"tell (?:me )?what(?:'s| is) in [\"']?" + _FILE_NAME + r"[\"']?",
+    r"(?:can you )?check (?:the )?contents of [\"']?" + _FILE_NAME + r"[\"']?",
+    r"what is in " + _FILE_NAME,  # Simpler pattern for direct questions
+    r"show me " + _FILE_NAME,     # Common "show me file.txt" pattern
+    r"show me the contents of " + _FILE_NAME  # Explicit "show me the contents of" pattern
+]))
+
+@functools.lru_cache(maxsize=4096)
+def _classify_file_request(text_lower):
+    """Classify a lowercased request as a file view or file listing.
+    
+    Only the pure pattern matching lives here; building the action is left
+    to the caller so cached results are never shared as mutable dicts.
+    
+    Args:
+        text_lower: Lowercased user text input
+        
+    Returns:
+        tuple or None: ("view", basename) or ("list", None), None if no match
+    """
+    # Check for file viewing patterns
+    match = _VIEW_FILE_RE.search(text_lower)
+    if match:
+        # Only the alternative that matched captured anything
+        filename = match.group(match.lastindex)
+        return "view", os.path.basename(filename)
+            
+    # Check for file listing patterns
+    if _LIST_FILES_RE.search(text_lower):
+        return "list", None
+        
+    # No direct file operation detected
+    return None
+
 class LLMController:
     """
     Controller for LLM mode operations.
@@ -112,7 +173,7 @@ class LLMController:
             dict or None: Structured response with action if found, None otherwise
         """
         # Check if response contains JSON block
-        json_match = re.search(r'```(?:json)?\s*({[\s\S]*?})\s*```', response_text)
+        json_match = _JSON_BLOCK_RE.search(response_text)
         if json_match:
             try:
                 json_str = json_match.group(1)
@@ -130,8 +191,7 @@ class LLMController:
         # Try to find JSON without code blocks
         try:
             # Look for JSON object pattern
-            json_pattern = r'({[\s\S]*?})'
-            matches = re.findall(json_pattern, response_text)
+            matches = _JSON_OBJECT_RE.findall(response_text)
             
             for match in matches:
                 try:
@@ -149,29 +209,22 @@ class LLMController:
             
         # Try to extract file operations using regex patterns
         try:
-            # Check for file operations using regex patterns
-            # File read patterns
-            read_patterns = [
-                r"show you what's in ([a-zA-Z0-9_\-\.\/~]+\.[a-zA-Z0-9]+)",
-                r"show you the contents of ([a-zA-Z0-9_\-\.\/~]+\.[a-zA-Z0-9]+)",
-                r"read ([a-zA-Z0-9_\-\.\/~]+\.[a-zA-Z0-9]+)",
-                r"open ([a-zA-Z0-9_\-\.\/~]+\.[a-zA-Z0-9]+)"
-            ]
+            response_lower = response_text.lower()
             
-            for pattern in read_patterns:
-                match = re.search(pattern, response_text.lower())
-                if match:
-                    file_path = match.group(1)
-                    return {
-                        "response": response_text,
-                        "action": {
-                            "type": "os_command",
-                            "command": f"cat {file_path}"
-                        }
+            # File read patterns
+            match = _READ_FILE_RE.search(response_lower)
+            if match:
+                file_path = match.group(1)
+                return {
+                    "response": response_text,
+                    "action": {
+                        "type": "os_command",
+                        "command": f"cat {file_path}"
                     }
+                }
                     
             # Directory listing patterns
-            if "list the files in the current directory" in response_text.lower():
+            if "list the files in the current directory" in response_lower:
                 return {
                     "response": response_text,
                     "action": {
@@ -181,21 +234,16 @@ class LLMController:
                 }
                 
             # File check patterns
-            check_patterns = [
-                r"check if ([a-zA-Z0-9_\-\.\/~]+\.[a-zA-Z0-9]+) exists"
-            ]
-            
-            for pattern in check_patterns:
-                match = re.search(pattern, response_text.lower())
-                if match:
-                    file_path = match.group(1)
-                    return {
-                        "response": response_text,
-                        "action": {
-                            "type": "file_check",
-                            "file_path": file_path
-                        }
+            match = _CHECK_FILE_RE.search(response_lower)
+            if match:
+                file_path = match.group(1)
+                return {
+                    "response": response_text,
+                    "action": {
+                        "type": "file_check",
+                        "file_path": file_path
                     }
+                }
         except Exception:
             pass
                 
@@ -212,65 +260,40 @@ class LLMController:
         Returns:
             dict or None: Structured response with file action if detected, None otherwise
         """
-        import re  # Make sure we import it in the function scope
-        text_lower = text_input.lower()
+        # Normalize so repeated phrasings share one cache entry
+        text_lower = text_input.strip().lower()
         
         # Data directory path - all file operations will be directed here
         data_dir = str(app_config.DATA_DIR)
         
-        # Common file viewing and reading patterns
-        view_patterns = [
-            r"what('s| is) in (?:the )?file (?:named )?[\"']?([a-zA-Z0-9_\.\/-]+\.[a-zA-Z0-9]+)[\"']?",
-            r"(show|display|view|read|open|cat)(?:[ \t]+me)? (?:the )?(?:contents of )?(?:file )?[\"']?([a-zA-Z0-9_\.\/-]+\.[a-zA-Z0-9]+)[\"']?",
-            r"tell (?:me )?what('s| is) in [\"']?([a-zA-Z0-9_\.\/-]+\.[a-zA-Z0-9]+)[\"']?",
-            r"(?:can you )?check (?:the )?contents of [\"']?([a-zA-Z0-9_\.\/-]+\.[a-zA-Z0-9]+)[\"']?",
-            r"what is in ([a-zA-Z0-9_\.\/-]+\.[a-zA-Z0-9]+)",  # Simpler pattern for direct questions
-            r"show me ([a-zA-Z0-9_\.\/-]+\.[a-zA-Z0-9]+)",     # Common "show me file.txt" pattern
-            r"show me the contents of ([a-zA-Z0-9_\.\/-]+\.[a-zA-Z0-9]+)"  # Explicit "show me the contents of" pattern
-        ]
-        
-        # Check for file viewing patterns
-        for pattern in view_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                # Extract the filename from the pattern match
-                filename = match.group(2) if len(match.groups()) > 1 else match.group(1)
-                
-                # Always use just the basename of the file in the data directory
-                # This ensures all file operations are contained within the data directory
-                base_filename = os.path.basename(filename)
-                file_path = os.path.join(data_dir, base_filename)
-                
-                return {
-                    "response": f"I'll check if the file '{base_filename}' exists in the data directory and show you its contents.",
-                    "action": {
-                        "type": "os_command",
-                        "command": f"cat {file_path}"
-                    },
-                    "chained_action": True
-                }
-                
-        # Common file listing patterns
-        list_patterns = [
-            r"(?:can you )?(list|show|display) (?:all )?(?:the )?files(?: in this directory)?",
-            r"what files (?:are|do we have)(?: in this directory)?",
-            r"(?:can you )?show me (?:all )?(?:the )?files"
-        ]
-        
-        # Check for file listing patterns
-        for pattern in list_patterns:
-            if re.search(pattern, text_lower):
-                return {
-                    "response": "I'll list the files in the data directory for you.",
-                    "action": {
-                        "type": "os_command",
-                        "command": f"ls -la {data_dir}"
-                    },
-                    "chained_action": True
-                }
-        
-        # No direct file operation detected
-        return None
+        # Classification is pure, so repeated phrasings are served from cache
+        match = _classify_file_request(text_lower)
+        if match is None:
+            return None
+            
+        kind, base_filename = match
+        if kind == "view":
+            # Always use just the basename of the file in the data directory
+            # This ensures all file operations are contained within the data directory
+            file_path = os.path.join(data_dir, base_filename)
+            
+            return {
+                "response": f"I'll check if the file '{base_filename}' exists in the data directory and show you its contents.",
+                "action": {
+                    "type": "os_command",
+                    "command": f"cat {file_path}"
+                },
+                "chained_action": True
+            }
+            
+        return {
+            "response": "I'll list the files in the data directory for you.",
+            "action": {
+                "type": "os_command",
+                "command": f"ls -la {data_dir}"
+            },
+            "chained_action": True
+        }
     
     def validate_action(self, action):
         """Validate the structure and completeness of an action.
@@ -6,21 +6,34 @@ This module handles the execution of system actions with safety checks.
 
 import os
 import re
-import glob
+import stat
+import fnmatch
+import functools
 import subprocess
 import shlex
 import platform
-import difflib
 from pathlib import Path
 
 from tools.logger import setup_logger
 from tools.validator import ActionValidator
-from tools.file_utils import resolve_path
+from tools.file_utils import resolve_path, find_similar_files, is_text_file
 import config
 
 # Setup logger
 logger = setup_logger()
 
+@functools.lru_cache(maxsize=64)
+def _compile_glob(pattern):
+    """Compile a shell-style file pattern into a regex.
+    
+    Args:
+        pattern: Normalized-case glob pattern, e.g. '*.json'
+        
+    Returns:
+        re.Pattern: Compiled pattern matching whole file names
+    """
+    return re.compile(fnmatch.translate(pattern))
+
 class OSController:
     """
     Controller for OS mode operations.
@@ -337,7 +350,7 @@ class OSController:
             data_path = os.path.join(config.DATA_DIR, file_path)
             
             # If file exists in data directory, use that
-            if os.path.exists(data_path) and os.path.isfile(data_path):
+            if os.path.isfile(data_path):
                 logger.info(f"File found in data directory: {data_path}")
                 resolved_path = data_path
             else:
@@ -350,10 +363,14 @@ class OSController:
         logger.info(f"Checking if file exists: {resolved_path}")
         
         try:
-            if os.path.exists(resolved_path):
-                if os.path.isfile(resolved_path):
-                    # Get file info
-                    stats = os.stat(resolved_path)
+            # A single stat answers existence, type and size together
+            try:
+                stats = os.stat(resolved_path)
+            except OSError:
+                stats = None
+            
+            if stats is not None:
+                if stat.S_ISREG(stats.st_mode):
                     # Determine if it's a text file
                     file_type = "text" if self._is_text_file(resolved_path) else "binary"
                     
@@ -420,47 +437,81 @@ class OSController:
         logger.info(f"Searching for directory: {dir_name}")
         
         try:
-            # List of common base directories to search
-            search_paths = [
-                os.getcwd(),  # Current directory
-                os.path.dirname(os.getcwd()),  # Parent directory
+            # List of common base directories to search. These often
+            # coincide (e.g. the parent directory is the project root), so
+            # each distinct tree is only walked once.
+            cwd = os.getcwd()
+            search_paths = list(dict.fromkeys(os.path.normpath(path) for path in [
+                cwd,  # Current directory
+                os.path.dirname(cwd),  # Parent directory
                 str(config.ROOT_DIR),  # Project root
                 os.path.expanduser("~")  # Home directory
-            ]
+            ]))
             
             results = []
+            seen_paths = set()
+            needle = dir_name.lower()
             
             # First try the exact name as a path
             resolved_path = resolve_path(dir_name)
-            if os.path.exists(resolved_path) and os.path.isdir(resolved_path):
+            if os.path.isdir(resolved_path):
                 results.append({
                     "path": resolved_path,
                     "is_exact_match": True,
                     "abs_path": os.path.abspath(resolved_path)
                 })
+                seen_paths.add(resolved_path)
                 
-            # Then search for the directory name in common locations
+            # Then search for the directory name in common locations, walking
+            # each tree depth-first with an explicit stack in os.walk order
             for base_path in search_paths:
-                for root, dirs, _ in os.walk(base_path, topdown=True, followlinks=False):
-                    # Skip venv and hidden directories for efficiency
-                    dirs[:] = [d for d in dirs if d != "venv" and not d.startswith(".")]
+                stack = [base_path]
+                while stack:
+                    root = stack.pop()
                     
                     # Check depth to avoid going too deep
                     depth = root[len(base_path):].count(os.sep)
                     if depth > 3:  # Limit search depth
-                        dirs[:] = []
                         continue
+                    
+                    try:
+                        with os.scandir(root) as it:
+                            entries = list(it)
+                    except OSError:
+                        continue
+                    
+                    subdirs = []
+                    for entry in entries:
+                        try:
+                            if not entry.is_dir():
+                                continue
+                        except OSError:
+                            continue
                         
-                    # Check each directory for a match
-                    for d in dirs:
-                        if dir_name.lower() in d.lower():
-                            full_path = os.path.join(root, d)
-                            results.append({
-                                "path": full_path,
-                                "name": d,
-                                "abs_path": os.path.abspath(full_path),
-                                "is_exact_match": d.lower() == dir_name.lower()
-                            })
+                        # Skip venv and hidden directories for efficiency
+                        d = entry.name
+                        if d == "venv" or d.startswith("."):
+                            continue
+                        
+                        # Check each directory for a match
+                        d_lower = d.lower()
+                        if needle in d_lower:
+                            full_path = entry.path
+                            # Overlapping trees can reach the same directory twice
+                            if full_path not in seen_paths:
+                                seen_paths.add(full_path)
+                                results.append({
+                                    "path": full_path,
+                                    "name": d,
+                                    "abs_path": os.path.abspath(full_path),
+                                    "is_exact_match": d_lower == needle
+                                })
+                        
+                        # Linked directories can match but are never descended into
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    
+                    stack.extend(reversed(subdirs))
                             
             # Stop if we have too many results
             if len(results) > 20:
@@ -517,44 +568,50 @@ class OSController:
                 "returncode": 1
             }
         
-        # Check if pattern has wildcards
+        # Check if pattern has wildcards; repeated searches share one compiled glob
         has_wildcards = "*" in file_pattern or "?" in file_pattern
+        if has_wildcards:
+            pattern_re = _compile_glob(os.path.normcase(file_pattern))
         
         results = []
         try:
-            for root, dirs, files in os.walk(search_dir, topdown=True, followlinks=False):
-                # Skip venv and hidden directories
-                dirs[:] = [d for d in dirs if d != "venv" and not d.startswith(".")]
-                
-                # Check depth
-                rel_path = os.path.relpath(root, search_dir)
-                depth = 0 if rel_path == "." else rel_path.count(os.sep) + 1
-                if depth > max_depth:
-                    dirs[:] = []  # Don't go deeper
+            # Depth-first walk with an explicit stack, in the same order as
+            # os.walk(topdown=True). DirEntry type checks come from the
+            # directory listing itself, so no per-entry stat is needed.
+            stack = [(search_dir, 0)]
+            while stack and len(results) < max_results:
+                root, depth = stack.pop()
+                try:
+                    with os.scandir(root) as it:
+                        entries = list(it)
+                except OSError:
                     continue
                 
-                # Check each file for a match
-                for file in files:
-                    match = False
+                subdirs = []
+                for entry in entries:
+                    if entry.is_dir():
+                        # Skip venv and hidden directories, and never follow links
+                        if entry.name != "venv" and not entry.name.startswith(".") and not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        continue
                     
                     if has_wildcards:
                         # Use glob pattern matching
-                        match = glob.fnmatch.fnmatch(file, file_pattern)
+                        match = pattern_re.match(os.path.normcase(entry.name)) is not None
                     else:
                         # Use exact match or substring match
-                        match = (file == file_pattern) or (file_pattern in file)
+                        match = file_pattern in entry.name
                     
                     if match:
-                        full_path = os.path.join(root, file)
-                        results.append(full_path)
+                        results.append(os.path.join(root, entry.name))
                         
                         # Limit results
                         if len(results) >= max_results:
                             break
                 
-                # Break early if we have enough results
-                if len(results) >= max_results:
-                    break
+                # Check depth before descending
+                if depth < max_depth:
+                    stack.extend((path, depth + 1) for path in reversed(subdirs))
         
         except Exception as e:
             return {
@@ -591,34 +648,7 @@ class OSController:
         Returns:
             bool: True if the file is likely a text file
         """
-        try:
-            if not os.path.exists(file_path) or not os.path.isfile(file_path):
-                return False
-                
-            # Standard text extensions
-            text_extensions = ['.txt', '.md', '.json', '.py', '.js', '.html', '.css', '.csv', '.xml', '.yaml', '.yml']
-            ext = os.path.splitext(file_path)[1].lower()
-            
-            # Fast check based on extension
-            if ext in text_extensions:
-                return True
-                
-            # Check file content for binary characters
-            with open(file_path, 'rb') as f:
-                chunk = f.read(sample_size)
-                
-            # If it contains null bytes or too many non-ASCII chars, it's likely binary
-            if b'\x00' in chunk:
-                return False
-                
-            # Count non-ASCII characters
-            non_ascii = len([b for b in chunk if b > 127])
-            
-            # If more than 30% are non-ASCII, likely binary
-            return (non_ascii / len(chunk)) < 0.3 if chunk else True
-            
-        except Exception:
-            return False
+        return is_text_file(file_path, sample_size)
     
     def _find_similar_files(self, file_name, directory):
         """Find files with similar names to the one provided.
@@ -630,46 +660,7 @@ class OSController:
         Returns:
             list: List of similar files found
         """
-        similar_files = []
-        
-        try:
-            if not os.path.exists(directory) or not os.path.isdir(directory):
-                return []
-                
-            # Get all files in the directory
-            all_files = [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
-            
-            # Get file name without extension
-            base_name = os.path.splitext(file_name)[0]
-            
-            # Find files with similar names
-            for f in all_files:
-                # Calculate similarity scores
-                name_similarity = difflib.SequenceMatcher(None, file_name, f).ratio()
-                basename_similarity = difflib.SequenceMatcher(None, base_name, os.path.splitext(f)[0]).ratio()
-                
-                # Use the higher of the two similarity scores
-                similarity = max(name_similarity, basename_similarity)
-                
-                # Include files above a certain similarity threshold
-                if similarity > 0.5:
-                    full_path = os.path.join(directory, f)
-                    similar_files.append({
-                        "name": f,
-                        "path": full_path,
-                        "similarity": round(similarity, 2),
-                        "size": os.path.getsize(full_path)
-                    })
-                    
-            # Sort by similarity (highest first)
-            similar_files.sort(key=lambda x: x["similarity"], reverse=True)
-            
-            # Limit the number of results
-            return similar_files[:5]
-            
-        except Exception as e:
-            logger.error(f"Error finding similar files: {e}")
-            return []
+        return find_similar_files(file_name, directory)
     
     def get_system_info_string(self):
         """Get system information as a formatted string for the LLM."""
@@ -21,6 +21,8 @@ class PromptBuilder:
     def __init__(self):
         """Initialize the prompt builder."""
         self.system_prompt = app_config.DEFAULT_SYSTEM_PROMPT
+        # (scene_context, header, footer) for the most recent scene prompt
+        self._scene_frame = None
     
     def build_standard_prompt(self, user_input, conversation_history=None):
         """Build a standard prompt for the LLM.
@@ -54,13 +56,45 @@ class PromptBuilder:
         Returns:
             str: Formatted prompt
         """
+        # The scene framing is the same every turn, so render it once
+        header, footer = self._scene_prompt_frame(scene_context)
+        prompt_parts = [header]
+        
+        # Add conversation history
+        if conversation_history:
+            for entry in conversation_history:
+                prompt_parts.append(f"User: {entry['user']}")
+                prompt_parts.append(f"You: {entry['assistant']}")
+        
+        # Add current user input
+        prompt_parts.append(f"## Current User Input\n{user_input}")
+        prompt_parts.append(footer)
+        
+        # Join all parts with double newlines for clear separation
+        return "\n\n".join(prompt_parts)
+    
+    def _scene_prompt_frame(self, scene_context):
+        """Render the parts of a scene prompt that do not change between turns.
+        
+        The result is reused for as long as the same scene_context object is
+        passed in; scene contexts are loaded once and never modified.
+        
+        Args:
+            scene_context: Scene context dictionary
+        
+        Returns:
+            tuple: (header, footer) strings placed around the conversation
+        """
+        if self._scene_frame is not None and self._scene_frame[0] is scene_context:
+            return self._scene_frame[1], self._scene_frame[2]
+        
         # Extract scene components
         roles = scene_context.get("roles", {})
         scene_description = scene_context.get("scene", "")
         constraints = scene_context.get("constraints", {})
         
         # Build prompt with scene context
-        prompt_parts = [
+        header_parts = [
             "You will role-play according to the following guidelines:",
             f"## Your Role\n{roles.get('client', 'Assistant')}",
             f"## User's Role\n{roles.get('user', 'Human')}",
@@ -68,25 +102,17 @@ class PromptBuilder:
             "## Conversation History"
         ]
         
-        # Add conversation history
-        if conversation_history:
-            for entry in conversation_history:
-                prompt_parts.append(f"User: {entry['user']}")
-                prompt_parts.append(f"You: {entry['assistant']}")
-        
-        # Add current user input
-        prompt_parts.append(f"## Current User Input\n{user_input}")
-        
         # Add constraints if available
+        footer_parts = []
         if constraints:
-            prompt_parts.append("## Constraints")
+            footer_parts.append("## Constraints")
             if "max_steps" in constraints:
-                prompt_parts.append(f"This conversation must resolve within {constraints['max_steps']} turns.")
+                footer_parts.append(f"This conversation must resolve within {constraints['max_steps']} turns.")
             if "style" in constraints:
-                prompt_parts.append(f"Style: {constraints['style']}")
+                footer_parts.append(f"Style: {constraints['style']}")
         
         # Add response instruction
-        prompt_parts.append("""## Instructions
+        footer_parts.append("""## Instructions
 Respond in-character based on the scene description.
 
 Your response MUST be in the following JSON format:
@@ -105,8 +131,10 @@ Your response MUST be in the following JSON format:
 If no action is needed, use "type": "none" for the action.
 """)
         
-        # Join all parts with double newlines for clear separation
-        return "\n\n".join(prompt_parts)
+        header = "\n\n".join(header_parts)
+        footer = "\n\n".join(footer_parts)
+        self._scene_frame = (scene_context, header, footer)
+        return header, footer
     
     def build_opening_message_prompt(self, scene_context):
         """Build a prompt to generate an opening message for a scene.
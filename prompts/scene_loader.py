@@ -60,7 +60,7 @@ class SceneLoader:
             # Load based on file type
             if ext.lower() in ['.yaml', '.yml']:
                 with open(scene_path, 'r') as f:
-                    scene_data = yaml.safe_load(f)
+                    scene_data = yaml.load(f, Loader=app_config.YAML_LOADER)
             elif ext.lower() == '.json':
                 with open(scene_path, 'r') as f:
                     scene_data = json.load(f)
@@ -1,14 +1,12 @@
-"""Pytest configuration file."""
-import os
-import sys
-import pytest
+"""Pytest configuration file.
 
-# Add the parent directory to the Python path
-# This allows imports from the project root
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+The project root is put on sys.path by the pythonpath setting in
+pytest.ini, so test modules import project packages directly.
+"""
+import pytest
 
 # Define fixtures that can be used across all tests
 @pytest.fixture
 def test_query():
     """Return a standard test query for LLM testing."""
-    return "What is a Raspberry Pi?"
\ No newline at end of file
+    return "What is a Raspberry Pi?"
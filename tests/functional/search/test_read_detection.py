@@ -1,6 +1,15 @@
 #!/usr/bin/env python3
 """Test improved file reading detection."""
-from file_tools import FileToolFactory
+import pytest
+
+# Written against the pre-refactor file_tools module, which is not in
+# this tree; skip under pytest until the test is ported
+try:
+    from file_tools import FileToolFactory
+except ImportError:
+    if __name__ == "__main__":
+        raise
+    pytest.skip("file_tools is not in this tree; test not ported", allow_module_level=True)
 
 def test_file_read_detection():
     """Test the detection of file reading requests."""
@@ -4,7 +4,16 @@ Test script to verify that file operations are properly directed to the data dir
 """
 import os
 import sys
-from file_assistant_middleware import StatefulController
+import pytest
+
+# Written against the pre-refactor file_assistant_middleware module, which is not in
+# this tree; skip under pytest until the test is ported
+try:
+    from file_assistant_middleware import StatefulController
+except ImportError:
+    if __name__ == "__main__":
+        raise
+    pytest.skip("file_assistant_middleware is not in this tree; test not ported", allow_module_level=True)
 
 def test_execution():
     # Create the controller
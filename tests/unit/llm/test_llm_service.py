@@ -1,198 +1,179 @@
-"""Test cases for the LLM service module."""
-import unittest
-import os
-import json
-from unittest.mock import patch, MagicMock
-import sys
-
-# Add parent directory to path to import module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from prototype.llm_service import LLMService
-
-class TestLLMService(unittest.TestCase):
-    """Test cases for the LLMService class."""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        # Save original environment variables
-        self.original_env = os.environ.copy()
-        
-        # Clear environment variables that might affect tests
-        if "OLLAMA_API_URL" in os.environ:
-            del os.environ["OLLAMA_API_URL"]
-        if "CLAUDE_API_KEY" in os.environ:
-            del os.environ["CLAUDE_API_KEY"]
-        if "GEMINI_API_KEY" in os.environ:
-            del os.environ["GEMINI_API_KEY"]
-
-    def tearDown(self):
-        """Tear down test fixtures."""
-        # Restore original environment variables
-        os.environ.clear()
-        os.environ.update(self.original_env)
-
-    @patch('prototype.llm_service.requests.get')
-    def test_check_ollama_available(self, mock_get):
-        """Test _check_ollama_available method."""
-        # Set up mock response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_get.return_value = mock_response
-        
-        # Initialize LLMService
-        llm_service = LLMService(model_type="llama")
-        
-        # Test Ollama available
-        self.assertTrue(llm_service._check_ollama_available())
-        
-        # Test Ollama not available (exception)
-        mock_get.side_effect = Exception("Connection error")
-        self.assertFalse(llm_service._check_ollama_available())
-        
-        # Test Ollama not available (non-200 status)
-        mock_get.side_effect = None
-        mock_response.status_code = 404
-        self.assertFalse(llm_service._check_ollama_available())
-
-    @patch('prototype.llm_service.GEMINI_AVAILABLE', True)
-    @patch('prototype.llm_service.genai')
-    def test_check_gemini_available(self, mock_genai):
-        """Test _check_gemini_available method."""
-        # Initialize LLMService with Gemini API key
-        os.environ["GEMINI_API_KEY"] = "fake_api_key"
-        llm_service = LLMService(model_type="gemini")
-        
-        # Test Gemini available
-        mock_genai.list_models.return_value = ["model1", "model2"]
-        self.assertTrue(llm_service._check_gemini_available())
-        
-        # Test Gemini not available (exception)
-        mock_genai.list_models.side_effect = Exception("API error")
-        self.assertFalse(llm_service._check_gemini_available())
-        
-        # Test Gemini not available (no API key)
-        del os.environ["GEMINI_API_KEY"]
-        llm_service = LLMService(model_type="gemini")
-        self.assertFalse(llm_service._check_gemini_available())
-
-    @patch('prototype.llm_service.GEMINI_AVAILABLE', False)
-    def test_gemini_library_not_available(self):
-        """Test behavior when Gemini library is not available."""
-        llm_service = LLMService(model_type="gemini")
-        self.assertFalse(llm_service._check_gemini_available())
-        self.assertTrue(llm_service.simulation_mode)
-
-    @patch('prototype.llm_service.LLMService._check_ollama_available')
-    @patch('prototype.llm_service.LLMService._check_gemini_available')
-    def test_llm_fallback_mechanism(self, mock_check_gemini, mock_check_ollama):
-        """Test LLM fallback mechanism."""
-        # Test Llama available
-        mock_check_ollama.return_value = True
-        mock_check_gemini.return_value = False
-        llm_service = LLMService(model_type="llama")
-        self.assertEqual(llm_service.model_type, "llama")
-        self.assertFalse(llm_service.simulation_mode)
-        
-        # Test Llama not available, Gemini available
-        mock_check_ollama.return_value = False
-        mock_check_gemini.return_value = True
-        os.environ["GEMINI_API_KEY"] = "fake_api_key"
-        llm_service = LLMService(model_type="llama")
-        self.assertEqual(llm_service.model_type, "gemini")
-        self.assertFalse(llm_service.simulation_mode)
-        
-        # Test neither available
-        mock_check_ollama.return_value = False
-        mock_check_gemini.return_value = False
-        llm_service = LLMService(model_type="llama")
-        self.assertTrue(llm_service.simulation_mode)
-        
-        # Test explicit request for Gemini
-        mock_check_gemini.return_value = True
-        llm_service = LLMService(model_type="gemini")
-        self.assertEqual(llm_service.model_type, "gemini")
-        self.assertFalse(llm_service.simulation_mode)
-
-    @patch('prototype.llm_service.LLMService._call_ollama')
-    @patch('prototype.llm_service.LLMService._call_gemini')
-    @patch('prototype.llm_service.LLMService._call_claude')
-    def test_process_input(self, mock_call_claude, mock_call_gemini, mock_call_ollama):
-        """Test process_input method with different model types."""
-        # Set up mock responses
-        mock_response = {
-            "response": "This is a test response",
-            "action": {"type": "none"}
-        }
-        mock_call_ollama.return_value = mock_response
-        mock_call_gemini.return_value = mock_response
-        mock_call_claude.return_value = mock_response
-        
-        # Test with Llama
-        with patch('prototype.llm_service.LLMService._check_ollama_available', return_value=True):
-            llm_service = LLMService(model_type="llama")
-            result = llm_service.process_input("Hello")
-            self.assertEqual(result, mock_response)
-            mock_call_ollama.assert_called_once()
-        
-        # Reset mocks
-        mock_call_ollama.reset_mock()
-        mock_call_gemini.reset_mock()
-        mock_call_claude.reset_mock()
-        
-        # Test with Gemini
-        with patch('prototype.llm_service.LLMService._check_gemini_available', return_value=True):
-            llm_service = LLMService(model_type="gemini")
-            result = llm_service.process_input("Hello")
-            self.assertEqual(result, mock_response)
-            mock_call_gemini.assert_called_once()
-        
+"""Test cases for provider selection and dispatch in the LLM provider module."""
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, DEFAULT
+
+import pytest
+
+import config
+from llm.local_llm import LLMProvider
+
+# Canned reply text a provider returns
+MOCK_RESPONSE = "This is a test response"
+
+
+@pytest.fixture(autouse=True)
+def clean_config(monkeypatch):
+    """Clear provider settings that might leak in from the developer's environment.
+
+    config reads the API keys once at import time, so they are patched on
+    the loaded settings rather than in os.environ. monkeypatch restores
+    only the keys touched here.
+    """
+    for provider in ("claude", "gemini"):
+        monkeypatch.setitem(config.LLM_PROVIDERS[provider], "api_key", "")
+    monkeypatch.setattr(config, "LLM_CACHE_DB", "")
+
+
+@pytest.fixture
+def no_ollama(monkeypatch):
+    """Report Ollama as unavailable instead of probing localhost:11434."""
+    monkeypatch.setattr(LLMProvider, "_check_ollama_available", lambda self: False)
+
+
+@pytest.mark.parametrize("side_effect,status_code,expected", [
+    # Ollama available
+    (None, 200, True),
+    # Ollama not available (exception)
+    (Exception("Connection error"), 200, False),
+    # Ollama not available (non-200 status)
+    (None, 404, False),
+])
+@patch('llm.local_llm.requests.get')
+def test_check_ollama_available(mock_get, side_effect, status_code, expected):
+    """Test _check_ollama_available method."""
+    # Set up mock response; the check only reads status_code
+    mock_get.return_value = SimpleNamespace(status_code=200)
+
+    # Initialize LLMProvider
+    provider = LLMProvider(model_type="llama")
+
+    # Switch the endpoint to the case under test
+    mock_get.side_effect = side_effect
+    mock_get.return_value = SimpleNamespace(status_code=status_code)
+    assert provider._check_ollama_available() == expected
+
+
+@pytest.mark.parametrize("api_key,list_models_error,expected", [
+    # Gemini available
+    ("fake_api_key", None, True),
+    # Gemini not available (exception)
+    ("fake_api_key", Exception("API error"), False),
+    # Gemini not available (no API key)
+    ("", Exception("API error"), False),
+])
+@patch('llm.local_llm.GEMINI_AVAILABLE', True)
+@patch('llm.local_llm.genai', create=True)
+def test_check_gemini_available(mock_genai, api_key, list_models_error, expected, monkeypatch, no_ollama):
+    """Test _check_gemini_available method."""
+    # Initialize LLMProvider, with the Gemini API key when the case has one
+    monkeypatch.setitem(config.LLM_PROVIDERS["gemini"], "api_key", api_key)
+    provider = LLMProvider(model_type="gemini")
+
+    # Switch the model listing to the case under test
+    mock_genai.list_models.return_value = ["model1", "model2"]
+    mock_genai.list_models.side_effect = list_models_error
+    assert provider._check_gemini_available() == expected
+
+
+@patch('llm.local_llm.GEMINI_AVAILABLE', False)
+def test_gemini_library_not_available(no_ollama):
+    """Test behavior when Gemini library is not available."""
+    provider = LLMProvider(model_type="gemini")
+    assert not provider._check_gemini_available()
+    assert provider.simulation_mode
+
+
+@pytest.mark.parametrize("ollama,gemini,requested,expected_type,simulation", [
+    # Llama available
+    (True, False, "llama", "llama", False),
+    # Llama not available, Gemini available
+    (False, True, "llama", "gemini", False),
+    # Neither available
+    (False, False, "llama", "llama", True),
+    # Explicit request for Gemini
+    (False, True, "gemini", "gemini", False),
+])
+def test_llm_fallback_mechanism(ollama, gemini, requested, expected_type, simulation, monkeypatch):
+    """Test LLM fallback mechanism."""
+    monkeypatch.setattr(LLMProvider, "_check_ollama_available", lambda self: ollama)
+    monkeypatch.setattr(LLMProvider, "_check_gemini_available", lambda self: gemini)
+
+    provider = LLMProvider(model_type=requested)
+    assert provider.model_type == expected_type
+    assert provider.simulation_mode == simulation
+
+
+@pytest.fixture
+def call_mocks():
+    """Patch every provider call method in one go.
+
+    Yields the mocks keyed by method name, e.g. call_mocks["_call_ollama"].
+    """
+    with patch.multiple(
+        'llm.local_llm.LLMProvider',
+        _call_ollama=DEFAULT,
+        _call_gemini=DEFAULT,
+        _call_claude=DEFAULT
+    ) as mocks:
+        yield mocks
+
+
+# (model type, provider call method generate_response should dispatch to)
+GENERATE_RESPONSE_CASES = (
+    ("llama", "_call_ollama"),
+    ("gemini", "_call_gemini"),
+    ("claude", "_call_claude"),
+)
+
+
+def test_generate_response(call_mocks):
+    """Test generate_response dispatch with different model types."""
+    # Set up mock responses
+    for mock_call in call_mocks.values():
+        mock_call.return_value = MOCK_RESPONSE
+
+    # Build one provider and switch its model for each case
+    with patch('llm.local_llm.LLMProvider._check_ollama_available', return_value=True):
+        provider = LLMProvider(model_type="llama")
+
+    for model_type, call_name in GENERATE_RESPONSE_CASES:
+        provider.model_type = model_type
+        provider.simulation_mode = False
+        assert provider.generate_response("Hello") == MOCK_RESPONSE
+        assert call_mocks[call_name].call_count == 1
+
         # Reset mocks
-        mock_call_ollama.reset_mock()
-        mock_call_gemini.reset_mock()
-        mock_call_claude.reset_mock()
-        
-        # Test with Claude
-        with patch('prototype.llm_service.LLMService._check_claude_available', return_value=True, create=True):
-            os.environ["CLAUDE_API_KEY"] = "fake_api_key"
-            llm_service = LLMService(model_type="claude")
-            llm_service.simulation_mode = False
-            result = llm_service.process_input("Hello")
-            self.assertEqual(result, mock_response)
-            mock_call_claude.assert_called_once()
-
-    @patch('prototype.llm_service.GEMINI_AVAILABLE', True)
-    @patch('prototype.llm_service.genai')
-    def test_call_gemini(self, mock_genai):
-        """Test _call_gemini method."""
-        # Set up mock response
-        mock_response = MagicMock()
-        mock_response.text = '{"response": "This is a test response", "action": {"type": "none"}}'
-        mock_genai.GenerativeModel.return_value.generate_content.return_value = mock_response
-        
-        # Initialize LLMService with Gemini API key
-        os.environ["GEMINI_API_KEY"] = "fake_api_key"
-        llm_service = LLMService(model_type="gemini")
-        llm_service.simulation_mode = False
-        
-        # Test with valid JSON response
-        prompt = {
-            "system": "You are a helpful assistant",
-            "conversation": "User: Hello\nAssistant:"
-        }
-        result = llm_service._call_gemini(prompt)
-        self.assertEqual(result["response"], "This is a test response")
-        self.assertEqual(result["action"]["type"], "none")
-        
-        # Test with non-JSON response
-        mock_response.text = "This is not a JSON response"
-        result = llm_service._call_gemini(prompt)
-        self.assertEqual(result["response"], "This is not a JSON response")
-        self.assertEqual(result["action"]["type"], "none")
-        
-        # Test with exception
-        mock_genai.GenerativeModel.return_value.generate_content.side_effect = Exception("API error")
-        result = llm_service._call_gemini(prompt)
-        self.assertIsNone(result)
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+        for mock_call in call_mocks.values():
+            mock_call.reset_mock()
+
+
+# Prompt sent in every _call_gemini case
+GEMINI_PROMPT = "You are a helpful assistant\n\nUser: Hello\nAssistant:"
+
+# (model reply text or raised error, expected result)
+GEMINI_CASES = (
+    # Reply text is returned as-is
+    (MOCK_RESPONSE, MOCK_RESPONSE),
+    # Exception
+    (Exception("API error"), None),
+)
+
+
+@pytest.mark.parametrize("reply,expected", GEMINI_CASES)
+@patch('llm.local_llm.GEMINI_AVAILABLE', True)
+@patch('llm.local_llm.genai', create=True)
+def test_call_gemini(mock_genai, reply, expected, monkeypatch, no_ollama):
+    """Test _call_gemini method."""
+    # Initialize LLMProvider with Gemini API key
+    monkeypatch.setitem(config.LLM_PROVIDERS["gemini"], "api_key", "fake_api_key")
+    provider = LLMProvider(model_type="gemini")
+    provider.simulation_mode = False
+
+    # Set up mock response, or make the API call fail
+    generate_content = mock_genai.GenerativeModel.return_value.generate_content
+    if isinstance(reply, Exception):
+        generate_content.side_effect = reply
+    else:
+        generate_content.return_value = MagicMock(text=reply)
+
+    assert provider._call_gemini(GEMINI_PROMPT) == expected
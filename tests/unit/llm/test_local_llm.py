@@ -0,0 +1,95 @@
+"""Test cases for the LLM provider's response cache."""
+import pytest
+
+import config
+from llm.local_llm import LLMProvider
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Return a provider that talks to a fake Ollama model, with no persistent cache."""
+    monkeypatch.setattr(config, "LLM_CACHE_DB", "")
+    monkeypatch.setattr(LLMProvider, "_check_ollama_available", lambda self: True)
+    provider = LLMProvider(model_type="llama")
+    provider.calls = []
+
+    def fake_call(prompt):
+        provider.calls.append(prompt)
+        return f"Answer to {prompt}"
+
+    monkeypatch.setattr(provider, "_call_ollama", fake_call)
+    return provider
+
+
+@pytest.fixture
+def persistent_provider(provider, monkeypatch, tmp_path):
+    """Build providers sharing one cache database, closing them at teardown.
+
+    Call it with the reply the fake model gives for a prompt.
+    """
+    monkeypatch.setattr(config, "LLM_CACHE_DB", str(tmp_path / "llm_cache.db"))
+    providers = []
+
+    def make(reply):
+        persistent = LLMProvider(model_type="llama")
+        monkeypatch.setattr(persistent, "_call_ollama", reply)
+        providers.append(persistent)
+        return persistent
+
+    yield make
+    for persistent in providers:
+        persistent._cache_db.close()
+
+
+def test_repeated_prompt_is_served_from_cache(provider):
+    """The same prompt only reaches the model once."""
+    assert provider.generate_response("Hello") == "Answer to Hello"
+    assert provider.generate_response("Hello") == "Answer to Hello"
+    assert provider.generate_response("Bye") == "Answer to Bye"
+    assert provider.calls == ["Hello", "Bye"]
+
+
+def test_cache_evicts_least_recently_used(provider, monkeypatch):
+    """Once full, the prompt used longest ago is dropped first."""
+    monkeypatch.setattr("llm.local_llm.RESPONSE_CACHE_SIZE", 2)
+    for prompt in ("a", "b", "a", "c", "a", "b"):
+        provider.generate_response(prompt)
+    assert provider.calls == ["a", "b", "c", "b"]
+
+
+def test_failed_call_is_not_cached(provider, monkeypatch):
+    """A failed model call falls back to simulation without poisoning the cache."""
+    monkeypatch.setattr(provider, "_call_ollama", lambda prompt: None)
+    assert "response" in provider.generate_response("Hello")
+    assert not provider._response_cache
+
+
+def test_responses_persist_across_providers(persistent_provider):
+    """A response stored by one provider is reused by the next one."""
+    first = persistent_provider(lambda prompt: f"Answer to {prompt}")
+    assert first.generate_response("Hello") == "Answer to Hello"
+
+    second = persistent_provider(lambda prompt: None)
+    assert second.generate_response("Hello") == "Answer to Hello"
+
+
+def test_persisted_responses_are_keyed_on_model_name(persistent_provider, monkeypatch):
+    """Switching the configured model does not reuse another model's answers."""
+    monkeypatch.setitem(config.LLM_PROVIDERS["llama"], "model_name", "llama2")
+    first = persistent_provider(lambda prompt: "answer from llama2")
+    first.generate_response("Hello")
+
+    monkeypatch.setitem(config.LLM_PROVIDERS["llama"], "model_name", "mistral")
+    second = persistent_provider(lambda prompt: "answer from mistral")
+    assert second.generate_response("Hello") == "answer from mistral"
+
+
+def test_persistent_cache_is_trimmed(persistent_provider, monkeypatch):
+    """The database keeps only the most recently used responses."""
+    monkeypatch.setattr("llm.local_llm.PERSISTENT_CACHE_SIZE", 2)
+    first = persistent_provider(lambda prompt: f"Answer to {prompt}")
+    for prompt in ("a", "b", "c"):
+        first.generate_response(prompt)
+
+    rows = first._cache_db.execute("SELECT v FROM llm_cache ORDER BY t").fetchall()
+    assert [row[0] for row in rows] == ["Answer to b", "Answer to c"]
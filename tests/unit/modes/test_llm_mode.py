@@ -0,0 +1,56 @@
+"""Test cases for direct file-operation detection in LLM mode."""
+import pytest
+
+from modes.llm_mode import LLMController, _classify_file_request
+
+
+@pytest.fixture
+def controller():
+    """Return an LLM controller running in simulation mode."""
+    _classify_file_request.cache_clear()
+    return LLMController(model_type="simulation")
+
+
+def test_detect_view_request(controller):
+    """A file view request becomes a chained cat of the file in the data directory."""
+    result = controller._detect_file_operations("Show me the contents of notes/hi.txt")
+    assert result["chained_action"]
+    assert result["action"]["type"] == "os_command"
+    assert result["action"]["command"].startswith("cat ")
+    assert result["action"]["command"].endswith("hi.txt")
+
+
+def test_detect_list_request(controller):
+    """A file listing request becomes a chained ls of the data directory."""
+    result = controller._detect_file_operations("What files do we have?")
+    assert result["action"]["command"].startswith("ls -la ")
+
+
+def test_detect_no_file_request(controller):
+    """Unrelated input is left for the LLM."""
+    assert controller._detect_file_operations("Tell me a joke") is None
+
+
+def test_repeated_requests_hit_detection_cache(controller):
+    """Case and surrounding whitespace do not defeat the detection cache."""
+    flows = [
+        ("Can you show me the content of test.txt?", "Yes, please show it"),
+        ("List files in the data directory", "Yes, list them"),
+    ]
+    for _ in range(2):
+        for query, follow_up in flows:
+            controller._detect_file_operations(query)
+            controller._detect_file_operations(f"  {query.upper()} ")
+            controller._detect_file_operations(follow_up)
+
+    info = _classify_file_request.cache_info()
+    assert info.misses == 4
+    assert info.hits == 8
+
+
+def test_cached_results_are_not_shared(controller):
+    """Each call gets its own action dict, even when served from the cache."""
+    first = controller._detect_file_operations("read test.txt")
+    first["action"]["command"] = "rm -rf /"
+    second = controller._detect_file_operations("read test.txt")
+    assert second["action"]["command"].startswith("cat ")
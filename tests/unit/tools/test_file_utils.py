@@ -0,0 +1,84 @@
+"""Test cases for the cached path lookups in file_utils."""
+import os
+
+import pytest
+
+from tools import file_utils
+
+
+@pytest.fixture
+def directory(tmp_path, monkeypatch):
+    """Return a directory old enough to be cached, with a clean cache."""
+    monkeypatch.setattr(file_utils, "_DIR_SNAPSHOT_MIN_AGE", 0)
+    monkeypatch.setattr(file_utils, "_DIR_SNAPSHOTS", {})
+    (tmp_path / "notes.txt").write_text("notes")
+    (tmp_path / "subdir").mkdir()
+    return tmp_path
+
+
+def test_snapshot_lists_only_files(directory):
+    """Subdirectories are left out of the listing."""
+    assert file_utils._dir_snapshot(str(directory)) == ("notes.txt",)
+
+
+def test_snapshot_is_reused_until_directory_changes(directory):
+    """The listing is cached, and a new file invalidates it."""
+    first = file_utils._dir_snapshot(str(directory))
+    assert file_utils._dir_snapshot(str(directory)) is first
+
+    (directory / "note.txt").write_text("note")
+    # Force a distinct mtime even on filesystems with coarse timestamps
+    stat = os.stat(directory)
+    os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    similar = file_utils.find_similar_files("note.txt", str(directory))
+    assert [f["name"] for f in similar] == ["note.txt", "notes.txt"]
+
+
+def test_relative_snapshot_follows_working_directory(directory, tmp_path_factory, monkeypatch):
+    """A relative directory is listed from the current working directory."""
+    other = tmp_path_factory.mktemp("other")
+    (other / "other.txt").write_text("other")
+    # Same mtime for both, so only the cache key can tell them apart
+    stat = os.stat(directory)
+    os.utime(other, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    monkeypatch.chdir(directory)
+    assert file_utils._dir_snapshot(".") == ("notes.txt",)
+    monkeypatch.chdir(other)
+    assert file_utils._dir_snapshot(".") == ("other.txt",)
+    assert file_utils.find_similar_files("other.txt", ".")[0]["path"] == os.path.join(".", "other.txt")
+
+
+def test_resolve_path_follows_filesystem_changes(tmp_path, monkeypatch):
+    """A file created in cwd takes priority, and a removed file is not returned."""
+    home = tmp_path / "home"
+    cwd = tmp_path / "cwd"
+    home.mkdir()
+    cwd.mkdir()
+    (home / "probe.txt").write_text("home")
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.chdir(cwd)
+
+    assert file_utils.resolve_path("probe.txt") == str(home / "probe.txt")
+
+    (cwd / "probe.txt").write_text("cwd")
+    assert file_utils.resolve_path("probe.txt") == str(cwd / "probe.txt")
+
+    (cwd / "probe.txt").unlink()
+    (home / "probe.txt").unlink()
+    assert file_utils.resolve_path("probe.txt") == str(cwd / "probe.txt")
+
+
+_SIMILAR_NAMES = ("hi.txt", "hello.txt", "help.md", "notes.txt", "readme.md", "Report-2024.pdf", "sample.txt")
+
+
+@pytest.mark.parametrize("query", ["helo.txt", "note.txt", "read.md", "report-2024.pdf", "Sample.TXT", "xyz.bin"])
+def test_similarity_backends_pick_the_same_files(query, monkeypatch):
+    """rapidfuzz and difflib report the same similar names for typical typos."""
+    pytest.importorskip("rapidfuzz")
+    monkeypatch.setattr(file_utils, "RAPIDFUZZ_AVAILABLE", True)
+    fast = file_utils._similarity_scores(query, _SIMILAR_NAMES)
+    monkeypatch.setattr(file_utils, "RAPIDFUZZ_AVAILABLE", False)
+    slow = file_utils._similarity_scores(query, _SIMILAR_NAMES)
+    assert fast.keys() == slow.keys()
@@ -0,0 +1,29 @@
+"""Test cases for the dangerous-command check in ActionValidator."""
+import pytest
+
+from tools.validator import ActionValidator
+
+
+@pytest.fixture
+def validator():
+    """Return a validator in safe mode."""
+    return ActionValidator(safe_mode=True)
+
+
+@pytest.mark.parametrize("command,expected", [
+    ("rm -rf /", True),
+    ("sudo dd if=/dev/zero of=/dev/sda", True),
+    ("CURL http://example.com", True),
+    ("ls -la && rm -rf ~", True),
+    ("ls -la", False),
+    ("echo ok", False),
+])
+def test_dangerous_command_detection(validator, command, expected):
+    """Fragments are matched case-insensitively anywhere in the command, chained parts included."""
+    assert validator.is_dangerous_command(command) == expected
+
+
+def test_empty_command_list_flags_nothing(validator):
+    """With no dangerous fragments configured, every command passes."""
+    validator.dangerous_commands = []
+    assert not validator.is_dangerous_command("rm -rf /")
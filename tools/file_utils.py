@@ -6,6 +6,7 @@ Provides helper functions for file path resolution and similarity checking.
 
 import os
 import glob
+import time
 import difflib
 from pathlib import Path
 
@@ -15,6 +16,32 @@ from tools.logger import setup_logger
 # Setup logger
 logger = setup_logger()
 
+# Try importing rapidfuzz for C-accelerated name matching
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Standard text extensions, accepted without reading the file
+_TEXT_EXTS = frozenset({'.txt', '.md', '.json', '.py', '.js', '.html', '.css', '.csv', '.xml', '.yaml', '.yml'})
+
+# Byte values above 127, stripped out to count non-ASCII bytes in a sample
+_NON_ASCII_BYTES = bytes(range(128, 256))
+
+# Names scoring at or below this similarity are not reported as similar
+_SIMILARITY_THRESHOLD = 0.5
+
+# Regular files per directory, keyed on the absolute directory path and
+# stored with the directory's mtime so any create, delete or rename
+# invalidates them
+_DIR_SNAPSHOTS = {}
+_DIR_SNAPSHOTS_MAX = 256
+
+# Directories modified this recently are not cached, since another change
+# within the same timestamp tick would leave the mtime unchanged
+_DIR_SNAPSHOT_MIN_AGE = 2.0
+
 def resolve_path(path_str):
     """Resolve a path string to its absolute form, handling relative paths.
     
@@ -36,8 +63,27 @@ def resolve_path(path_str):
     if os.path.isabs(path_str):
         return os.path.normpath(path_str)
         
+    # Look up the working directory once; abspath() would query it again
+    cwd = os.getcwd()
+    
+    resolved = _resolve_relative_path(path_str, cwd)
+    if resolved is None:
+        # Return the best guess (absolute path from current directory)
+        return os.path.normpath(os.path.join(cwd, path_str))
+    return resolved
+
+def _resolve_relative_path(path_str, cwd):
+    """Find an existing location for a relative path.
+    
+    Args:
+        path_str: A relative file or directory path, possibly with wildcards
+        cwd: Current working directory
+        
+    Returns:
+        str or None: Absolute path of the first match, None if nothing exists
+    """
     # If it's a relative path, make it absolute from current directory
-    abs_path = os.path.abspath(path_str)
+    abs_path = os.path.normpath(os.path.join(cwd, path_str))
     
     # Check if path exists
     if os.path.exists(abs_path):
@@ -47,23 +93,129 @@ def resolve_path(path_str):
     if "*" in path_str:
         matches = glob.glob(path_str)
         if matches:
-            return os.path.abspath(matches[0])
+            return os.path.normpath(os.path.join(cwd, matches[0]))
             
     # If we still don't have a valid path, try common base directories
     common_bases = [
         str(app_config.DATA_DIR),  # Data directory (priority)
-        os.getcwd(),  # Current directory
+        cwd,  # Current directory
         str(app_config.ROOT_DIR),  # Project directory
         os.path.expanduser("~")  # Home directory
     ]
     
-    for base in common_bases:
+    # Probe each distinct base once; the current directory was checked above
+    for base in dict.fromkeys(common_bases):
+        if base == cwd:
+            continue
         full_path = os.path.join(base, path_str)
         if os.path.exists(full_path):
             return full_path
             
-    # Return the best guess (absolute path from current directory)
-    return abs_path
+    return None
+
+def _dir_snapshot(directory):
+    """List the regular files in a directory, reusing the last listing while it is current.
+    
+    Args:
+        directory: Directory to list
+        
+    Returns:
+        tuple: Names of the files in the directory
+        
+    Raises:
+        OSError: If the directory cannot be read
+    """
+    # Relative paths name a different directory whenever cwd changes
+    directory = os.path.abspath(directory)
+    mtime = os.stat(directory).st_mtime_ns
+    cached = _DIR_SNAPSHOTS.get(directory)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+        
+    # scandir reports the type without a stat per entry
+    with os.scandir(directory) as it:
+        files = tuple(entry.name for entry in it if entry.is_file())
+        
+    if time.time_ns() - mtime >= _DIR_SNAPSHOT_MIN_AGE * 1e9:
+        if len(_DIR_SNAPSHOTS) >= _DIR_SNAPSHOTS_MAX:
+            _DIR_SNAPSHOTS.clear()
+        _DIR_SNAPSHOTS[directory] = (mtime, files)
+    return files
+
+def _similarity(a, b, threshold=0.5):
+    """Similarity ratio of two names, skipping the full comparison for poor matches.
+    
+    real_quick_ratio() and quick_ratio() are cheap upper bounds on ratio(),
+    so when either is already at or below the threshold the expensive
+    matching-block computation cannot lift the pair above it.
+    
+    Args:
+        a: First name
+        b: Second name
+        threshold: Scores at or below this value are never reported
+        
+    Returns:
+        float: Exact ratio, or an upper bound no greater than threshold
+    """
+    matcher = difflib.SequenceMatcher(None, a, b)
+    for bound in (matcher.real_quick_ratio, matcher.quick_ratio):
+        upper = bound()
+        if upper <= threshold:
+            return upper
+    return matcher.ratio()
+
+def _length_bound(a, b):
+    """Upper bound on the similarity ratio of two names from their lengths alone.
+    
+    Both difflib and rapidfuzz compute 2 * matches / (len(a) + len(b)), and
+    matches can never exceed the shorter name's length.
+    
+    Args:
+        a: First name
+        b: Second name
+        
+    Returns:
+        float: Bound between 0 and 1
+    """
+    total = len(a) + len(b)
+    return 2 * min(len(a), len(b)) / total if total else 1.0
+
+def _similarity_scores(file_name, names):
+    """Score each name against file_name, with and without extensions.
+    
+    Args:
+        file_name: The file name to compare against
+        names: Candidate file names
+        
+    Returns:
+        dict: Index into names -> best similarity, only for names above the threshold
+    """
+    base_name = os.path.splitext(file_name)[0]
+    base_names = [os.path.splitext(f)[0] for f in names]
+    scores = {}
+    
+    for query, choices in ((file_name, names), (base_name, base_names)):
+        # Names whose length alone rules out a match are never scored
+        candidates = {
+            index: choice for index, choice in enumerate(choices)
+            if _length_bound(query, choice) > _SIMILARITY_THRESHOLD
+        }
+        
+        if RAPIDFUZZ_AVAILABLE:
+            # Score all candidates in one call; scores are percentages. No
+            # processor, so names are compared as-is like the difflib path
+            matches = process.extract(query, candidates, scorer=fuzz.ratio, processor=None,
+                                      score_cutoff=_SIMILARITY_THRESHOLD * 100, limit=None)
+            scored = ((index, score / 100) for _, score, index in matches)
+        else:
+            scored = ((index, _similarity(query, choice)) for index, choice in candidates.items())
+        
+        # Keep the higher of the full-name and base-name scores
+        for index, score in scored:
+            if score > scores.get(index, 0.0):
+                scores[index] = score
+    
+    return {index: scores[index] for index in sorted(scores) if scores[index] > _SIMILARITY_THRESHOLD}
 
 def find_similar_files(file_name, directory):
     """Find files with similar names to the one provided.
@@ -78,33 +230,22 @@ def find_similar_files(file_name, directory):
     similar_files = []
     
     try:
-        if not os.path.exists(directory) or not os.path.isdir(directory):
-            return []
-            
         # Get all files in the directory
-        all_files = [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
-        
-        # Get file name without extension
-        base_name = os.path.splitext(file_name)[0]
+        try:
+            all_files = _dir_snapshot(directory)
+        except (FileNotFoundError, NotADirectoryError):
+            return []
         
-        # Find files with similar names
-        for f in all_files:
-            # Calculate similarity scores
-            name_similarity = difflib.SequenceMatcher(None, file_name, f).ratio()
-            basename_similarity = difflib.SequenceMatcher(None, base_name, os.path.splitext(f)[0]).ratio()
-            
-            # Use the higher of the two similarity scores
-            similarity = max(name_similarity, basename_similarity)
-            
-            # Include files above a certain similarity threshold
-            if similarity > 0.5:
-                full_path = os.path.join(directory, f)
-                similar_files.append({
-                    "name": f,
-                    "path": full_path,
-                    "similarity": round(similarity, 2),
-                    "size": os.path.getsize(full_path)
-                })
+        # Include files above the similarity threshold
+        for index, similarity in _similarity_scores(file_name, all_files).items():
+            name = all_files[index]
+            path = os.path.join(directory, name)
+            similar_files.append({
+                "name": name,
+                "path": path,
+                "similarity": round(similarity, 2),
+                "size": os.path.getsize(path)
+            })
                 
         # Sort by similarity (highest first)
         similar_files.sort(key=lambda x: x["similarity"], reverse=True)
@@ -127,15 +268,13 @@ def is_text_file(file_path, sample_size=512):
         bool: True if the file is likely a text file
     """
     try:
-        if not os.path.exists(file_path) or not os.path.isfile(file_path):
+        if not os.path.isfile(file_path):
             return False
             
-        # Standard text extensions
-        text_extensions = ['.txt', '.md', '.json', '.py', '.js', '.html', '.css', '.csv', '.xml', '.yaml', '.yml']
         ext = os.path.splitext(file_path)[1].lower()
         
         # Fast check based on extension
-        if ext in text_extensions:
+        if ext in _TEXT_EXTS:
             return True
             
         # Check file content for binary characters
@@ -146,8 +285,8 @@ def is_text_file(file_path, sample_size=512):
         if b'\x00' in chunk:
             return False
             
-        # Count non-ASCII characters
-        non_ascii = len([b for b in chunk if b > 127])
+        # Count non-ASCII characters by deleting them in one C-level pass
+        non_ascii = len(chunk) - len(chunk.translate(None, _NON_ASCII_BYTES))
         
         # If more than 30% are non-ASCII, likely binary
         return (non_ascii / len(chunk)) < 0.3 if chunk else True
@@ -6,12 +6,27 @@ Validates actions for safety and completeness before execution.
 
 import os
 import re
+import functools
 import config as app_config
 from tools.logger import setup_logger
 
 # Setup logger
 logger = setup_logger()
 
+@functools.lru_cache(maxsize=None)
+def _compile_command_patterns(commands):
+    """Compile literal command fragments into a single alternation regex.
+    
+    Args:
+        commands: Tuple of command fragments to match
+        
+    Returns:
+        re.Pattern or None: Compiled pattern, or None if there are no fragments
+    """
+    if not commands:
+        return None
+    return re.compile("|".join(re.escape(command) for command in commands))
+
 class ActionValidator:
     """
     Validator for action safety and completeness.
@@ -97,21 +112,15 @@ class ActionValidator:
         Returns:
             bool: True if the command appears dangerous
         """
+        # Pattern is compiled once per distinct command list and cached
+        dangerous_re = _compile_command_patterns(tuple(self.dangerous_commands))
+        if dangerous_re is None:
+            return False
+        
         # Convert to lowercase for matching
         cmd_lower = command.lower()
         
-        # Check against known dangerous patterns
-        for dangerous in self.dangerous_commands:
-            if dangerous in cmd_lower:
-                return True
-                
-        # Check for command chaining that might be trying to bypass checks
-        if ';' in cmd_lower or '&&' in cmd_lower or '||' in cmd_lower:
-            # Command chaining isn't automatically dangerous, but deserves extra scrutiny
-            for dangerous in self.dangerous_commands:
-                parts = re.split(r'[;&|]+', cmd_lower)
-                for part in parts:
-                    if dangerous in part.strip():
-                        return True
-                        
-        return False
\ No newline at end of file
+        # Check against known dangerous patterns. A single search over the
+        # whole command also covers chained commands (;, &&, ||, |): every
+        # chained part is a substring of it, so safe commands exit here.
+        return dangerous_re.search(cmd_lower) is not None